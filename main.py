@@ -31,17 +31,44 @@ import hmac
 import json
 import urllib.parse
 import base64
+import functools
 import asyncio
-from typing import Dict, Any, Optional, Union, List, Tuple, TypedDict, cast
+import time
+from typing import Callable, Dict, Any, Optional, Union, List, Tuple, TypedDict, cast
 
 from dotenv import load_dotenv
 from aiogram import Bot, Dispatcher, types, Router, F
 from aiogram.filters import Command
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton, WebAppInfo
 from aiogram.client.default import DefaultBotProperties
-from aiogram.fsm.storage.memory import MemoryStorage
 import aiohttp
 
+# Optional: aiodns lets aiohttp resolve hostnames without blocking the event loop
+try:
+    import aiodns  # noqa: F401
+    HAS_AIODNS: bool = True
+except ImportError:
+    HAS_AIODNS = False
+
+# Optional: orjson is a much faster drop-in for JSON parsing and serialization
+try:
+    import orjson
+
+    json_loads: Callable[[Union[str, bytes, bytearray]], Any] = orjson.loads
+
+    def json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    json_loads = json.loads
+    json_dumps = json.dumps
+
+# Optional: uvloop provides a faster event loop (not available on Windows)
+try:
+    import uvloop
+    HAS_UVLOOP: bool = True
+except ImportError:
+    HAS_UVLOOP = False
+
 # Import for TON address parsing
 try:
     from pytoniq_core import Cell, Address
@@ -94,8 +121,8 @@ if not all([BOT_TOKEN, CONTRACT_ADDRESS, QUICKNODE_ENDPOINT]):
 
 # Initialize bot with default properties
 bot: Bot = Bot(token=BOT_TOKEN, default=DefaultBotProperties(parse_mode=None))
-storage: MemoryStorage = MemoryStorage()
-dp: Dispatcher = Dispatcher(storage=storage)
+# The bot has no FSM states, so skip the FSM middleware on every update
+dp: Dispatcher = Dispatcher(disable_fsm=True)
 router: Router = Router()
 
 # Convert to non-Optional after validation
@@ -103,6 +130,19 @@ BOT_TOKEN = cast(str, BOT_TOKEN)
 CONTRACT_ADDRESS = cast(str, CONTRACT_ADDRESS)
 QUICKNODE_ENDPOINT = cast(str, QUICKNODE_ENDPOINT)
 
+# WebApp secret key depends only on the bot token, so derive it once
+_WEBAPP_SECRET_KEY: bytes = hmac.new(b"WebAppData", BOT_TOKEN.encode(), hashlib.sha256).digest()
+WEBAPP_AUTH_MAX_AGE: int = 86400  # Reject initData older than one day
+
+# runGetMethod request body, pre-serialized since only user_id and seqno vary
+_RUN_GET_METHOD_PAYLOAD_TEMPLATE: str = (
+    '{"address":%s,"method":"get_nft_address_by_index","stack":[["num","%%d"]],"seqno":%%d}'
+    % json_dumps(CONTRACT_ADDRESS).replace('%', '%%')
+)
+# QuickNode responses are a few KB, anything far larger is treated as an error
+MAX_RESPONSE_SIZE: int = 65536
+_JSON_POST_HEADERS: Dict[str, str] = {"Content-Type": "application/json", "accept": "application/json"}
+
 # Global HTTP session that will be used for all API requests
 # This follows best practices by reusing the same session for all requests
 http_session: Optional[aiohttp.ClientSession] = None
@@ -115,6 +155,34 @@ class SeqnoCache(TypedDict):
 
 # Cached seqno with timestamp to avoid too many requests
 _seqno_cache: SeqnoCache = {"value": 0, "timestamp": 0}
+# In-flight seqno fetch shared by all concurrent cache misses, so they make a
+# single request and all get its result (or its fallback value on failure)
+_seqno_fetch_task: Optional["asyncio.Task[int]"] = None
+# Background task that keeps the seqno cache warm
+_seqno_refresh_task: Optional[asyncio.Task] = None
+SEQNO_REFRESH_INTERVAL: int = 45  # Refresh before the 60 seconds cache expires
+
+
+class NftResultCache(TypedDict):
+    value: str
+    expires: float
+
+
+# Recent NFT check results per user, so repeated taps skip the blockchain calls
+_nft_result_cache: Dict[int, NftResultCache] = {}
+# In-flight lookups per user, so concurrent checks for the same user share one result
+_nft_lookup_tasks: Dict[int, "asyncio.Task[str]"] = {}
+NFT_MINTED_CACHE_TTL: int = 30  # Minted NFTs never become unminted
+NFT_NOT_MINTED_CACHE_TTL: int = 10  # Keep short so fresh payments show up quickly
+NFT_RESULT_CACHE_MAX_SIZE: int = 10000
+
+# NFT item addresses resolved via get_nft_address_by_index, they are fixed per user index
+_known_nft_addresses: Dict[int, str] = {}
+KNOWN_NFT_ADDRESSES_MAX_SIZE: int = 100000
+
+
+# NFT check message and how long it may be cached in seconds (0 means don't cache)
+NftLookupResult = Tuple[str, int]
 
 
 class ValidationResult(TypedDict, total=False):
@@ -128,7 +196,15 @@ async def get_session() -> aiohttp.ClientSession:
     if http_session is None or http_session.closed:
         http_session = aiohttp.ClientSession(
             timeout=aiohttp.ClientTimeout(total=30),
-            connector=aiohttp.TCPConnector(limit=10, force_close=False, enable_cleanup_closed=True)
+            connector=aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=32,
+                ttl_dns_cache=300,  # QuickNode host rarely changes, avoid re-resolving it
+                keepalive_timeout=75,  # Keep TLS connections alive between user checks
+                enable_cleanup_closed=True,
+                # aiodns can't run on the default Windows ProactorEventLoop
+                resolver=aiohttp.AsyncResolver() if HAS_AIODNS and sys.platform != "win32" else None
+            )
         )
     return http_session
 
@@ -136,43 +212,98 @@ async def get_session() -> aiohttp.ClientSession:
 def validate_telegram_webapp_data(init_data: str) -> ValidationResult:
     """Validates the data received from Telegram WebApp"""
     try:
-        parsed_data: Dict[str, str] = dict(urllib.parse.parse_qsl(init_data))
-        received_hash: Optional[str] = parsed_data.pop('hash', None)
+        # Single pass over the raw query string, keeping pairs URL-encoded until needed
+        data_pairs: List[str] = []
+        received_hash: Optional[str] = None
+        user_data_str: Optional[str] = None
+        auth_date_str: Optional[str] = None
+        for pair in init_data.split('&'):
+            if not pair:
+                continue
+            if pair.startswith('hash='):
+                received_hash = urllib.parse.unquote_plus(pair[5:])
+                continue
+            if pair.startswith('user='):
+                user_data_str = urllib.parse.unquote_plus(pair[5:])
+            elif pair.startswith('auth_date='):
+                auth_date_str = pair[10:]
+            data_pairs.append(pair)
+
+        if not received_hash or len(received_hash) != 64:
+            logger.warning("Hash missing or malformed in initData")
+            return {"isValid": False}
 
-        if not received_hash:
-            logger.warning("Hash missing in initData")
+        # Reject stale or replayed data before spending time on the HMAC
+        if not auth_date_str or not auth_date_str.isdigit():
+            logger.warning("auth_date missing or malformed in initData")
+            return {"isValid": False}
+        if time.time() - int(auth_date_str) > WEBAPP_AUTH_MAX_AGE:
+            logger.warning(f"Expired initData: auth_date {auth_date_str}")
             return {"isValid": False}
 
-        # Create data check string
-        data_check_arr: List[str] = [f"{key}={parsed_data[key]}" for key in sorted(parsed_data.keys())]
-        data_check_string: str = '\n'.join(data_check_arr)
+        # Create data check string (sorted by key, with URL-decoded values)
+        data_pairs.sort(key=lambda pair: pair.partition('=')[0])
+        data_check_string: str = '\n'.join(urllib.parse.unquote_plus(pair) for pair in data_pairs)
 
         # Calculate hash
-        secret_key: bytes = hmac.new(b"WebAppData", BOT_TOKEN.encode(), hashlib.sha256).digest()
-        calculated_hash: str = hmac.new(secret_key, data_check_string.encode(), hashlib.sha256).hexdigest()
+        try:
+            received_digest: bytes = bytes.fromhex(received_hash)
+        except ValueError:
+            logger.warning(f"Malformed hash in initData: {received_hash}")
+            return {"isValid": False}
+
+        calculated_digest: bytes = hmac.new(_WEBAPP_SECRET_KEY, data_check_string.encode(), hashlib.sha256).digest()
 
-        if calculated_hash != received_hash:
-            logger.warning(f"Hash mismatch: calculated {calculated_hash}, received {received_hash}")
+        if not hmac.compare_digest(calculated_digest, received_digest):
+            logger.warning(f"Hash mismatch: received {received_hash}")
             return {"isValid": False}
 
         # Extract user data
-        user_data_str: Optional[str] = parsed_data.get('user')
         if not user_data_str:
             logger.warning("User data missing in initData")
             return {"isValid": False, "userId": None}
 
-        user_data: Dict[str, Any] = json.loads(user_data_str)
+        user_data: Dict[str, Any] = json_loads(user_data_str)
         return {
             "isValid": True,
             "userId": user_data.get('id')
         }
+    except ValueError as e:
+        # Malformed user JSON or encoding, expected from bogus clients
+        logger.warning(f"Invalid Telegram data: {e}")
+        return {"isValid": False}
     except Exception as e:
         logger.error(f"Error validating Telegram data: {e}", exc_info=True)
         return {"isValid": False}
 
 
-async def check_nft_active(nft_address: str) -> bool:
-    """Check if a TON smart contract at the given address is active"""
+async def read_json_response(response: aiohttp.ClientResponse) -> Dict[str, Any]:
+    """Read and decode a JSON API response, refusing bodies larger than MAX_RESPONSE_SIZE"""
+    # Same check as response.json(), so HTML/text error pages fail as a ClientResponseError
+    content_type: str = response.content_type
+    if not (content_type == "application/json" or content_type.endswith("+json")):
+        raise aiohttp.ContentTypeError(
+            response.request_info,
+            response.history,
+            status=response.status,
+            message=f"Attempt to decode JSON with unexpected mimetype: {content_type}",
+            headers=response.headers
+        )
+
+    if response.content_length is not None and response.content_length > MAX_RESPONSE_SIZE:
+        raise ValueError(f"Response too large: {response.content_length} bytes")
+
+    # Read in chunks so a body without Content-Length is never buffered past the limit
+    raw: bytearray = bytearray()
+    async for chunk in response.content.iter_chunked(8192):
+        raw.extend(chunk)
+        if len(raw) > MAX_RESPONSE_SIZE:
+            raise ValueError(f"Response larger than {MAX_RESPONSE_SIZE} bytes")
+    return json_loads(raw)
+
+
+async def check_nft_active(nft_address: str) -> Optional[bool]:
+    """Check if a TON smart contract at the given address is active, None if the check failed"""
     endpoint_url: str = f"{QUICKNODE_ENDPOINT}/getAddressState"
     full_url: str = f"{endpoint_url}?address={nft_address}"
 
@@ -183,32 +314,59 @@ async def check_nft_active(nft_address: str) -> bool:
                 headers={"accept": "application/json"},
                 raise_for_status=True
         ) as response:
-            data: Dict[str, Any] = await response.json()
+            data: Dict[str, Any] = await read_json_response(response)
 
             if not data.get("ok", False):
                 logger.warning(f"API error: {data.get('error', 'Unknown error')}")
-                return False
+                return None
 
             state: str = data.get("result", "")
             return state == "active"
 
     except aiohttp.ClientResponseError as e:
         logger.warning(f"Failed API call to getAddressState: {e.status}")
-        return False
+        return None
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.warning(f"Network error calling getAddressState: {e!r}")
+        return None
+    except ValueError as e:
+        logger.warning(f"Invalid response from getAddressState: {e}")
+        return None
     except Exception as e:
         logger.error(f"Error checking if NFT is active: {e}", exc_info=True)
-        return False
+        return None
+
+
+def _refresh_seqno() -> "asyncio.Task[int]":
+    """Start a seqno fetch, or join the one that is already in flight"""
+    global _seqno_fetch_task
+    if _seqno_fetch_task is None or _seqno_fetch_task.done():
+        _seqno_fetch_task = asyncio.ensure_future(_fetch_seqno(time.monotonic()))
+    return _seqno_fetch_task
 
 
 async def get_current_seqno() -> int:
     """Fetch the current sequence number (seqno) from the TON blockchain, with caching"""
-    global _seqno_cache
-
     # Cache seqno for 1 minute to reduce API calls
-    current_time: float = asyncio.get_event_loop().time()
+    current_time: float = time.monotonic()
     if current_time - _seqno_cache["timestamp"] < 60:  # 60 seconds cache
         return _seqno_cache["value"]
 
+    # Shield the shared fetch so one cancelled caller doesn't cancel it for the others
+    return await asyncio.shield(_refresh_seqno())
+
+
+async def refresh_seqno_periodically() -> None:
+    """Keep the seqno cache fresh so user requests never wait for getMasterchainInfo"""
+    while True:
+        await asyncio.shield(_refresh_seqno())
+        await asyncio.sleep(SEQNO_REFRESH_INTERVAL)
+
+
+async def _fetch_seqno(current_time: float) -> int:
+    """Request the latest masterchain seqno and store it in the cache"""
+    global _seqno_cache
+
     try:
         masterchain_url: str = f"{QUICKNODE_ENDPOINT.rstrip('/')}/getMasterchainInfo"
         session: aiohttp.ClientSession = await get_session()
@@ -218,7 +376,7 @@ async def get_current_seqno() -> int:
                 headers={"accept": "application/json"},
                 raise_for_status=True
         ) as response:
-            data: Dict[str, Any] = await response.json()
+            data: Dict[str, Any] = await read_json_response(response)
 
             if not data.get("ok", False):
                 logger.warning(f"API error fetching masterchain info: {data.get('error', 'Unknown error')}")
@@ -237,59 +395,160 @@ async def get_current_seqno() -> int:
     except aiohttp.ClientResponseError as e:
         logger.warning(f"Failed to get masterchain info: Status {e.status}")
         return _seqno_cache["value"] or 0  # Use cached value or 0
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.warning(f"Network error fetching masterchain info: {e!r}")
+        return _seqno_cache["value"] or 0  # Use cached value or 0
+    except ValueError as e:
+        logger.warning(f"Invalid response fetching masterchain info: {e}")
+        return _seqno_cache["value"] or 0  # Use cached value or 0
     except Exception as e:
         logger.exception(f"Error fetching current seqno: {e}")
         return _seqno_cache["value"] or 0  # Use cached value or 0
 
 
+def _parse_nft_cell(cell_boc_b64: str) -> Optional[str]:
+    """Parse the NFT address from a base64 BOC cell, or None for a zero address"""
+    # Decode and parse cell
+    cell_bytes: bytes = base64.b64decode(cell_boc_b64)
+    deserialized_cell: Cell = Cell.one_from_boc(cell_bytes)
+    addr_slice = deserialized_cell.begin_parse()
+    nft_addr_obj: Optional[Address] = addr_slice.load_address()
+
+    if not nft_addr_obj or nft_addr_obj.hash_part == b'\x00' * 32:
+        return None
+
+    # Convert address to string format
+    return nft_addr_obj.to_str(is_user_friendly=True, is_bounceable=True, is_url_safe=True)
+
+
+@functools.lru_cache(maxsize=1024)
+def _not_minted_msg(user_id: int, reason: str, detail: Union[int, str, None] = None, likely: bool = False) -> str:
+    """Build the "not minted" message for a user, cached for users who check repeatedly
+
+    `reason` may contain a `{}` placeholder for `detail`, which is only formatted on a cache miss.
+    """
+    if detail is not None:
+        reason = reason.format(detail)
+    return f"ℹ️ NFT for user {user_id} is {'likely not' if likely else 'not'} minted ({reason})."
+
+
+def _remember_nft_address(user_id: int, nft_address: str) -> None:
+    """Store the resolved NFT address for a user, evicting the oldest entry when full"""
+    if user_id not in _known_nft_addresses and len(_known_nft_addresses) >= KNOWN_NFT_ADDRESSES_MAX_SIZE:
+        del _known_nft_addresses[next(iter(_known_nft_addresses))]
+    _known_nft_addresses[user_id] = nft_address
+
+
+async def _check_nft_status(user_id: int, nft_address: str) -> NftLookupResult:
+    """Build the status message for a user's NFT address based on whether it's active"""
+    is_active: Optional[bool] = await check_nft_active(nft_address)
+    if is_active is None:
+        return "Error communicating with blockchain: could not check NFT address state", 0
+    if is_active:
+        return f"✅ Minted NFT Address: {nft_address}", NFT_MINTED_CACHE_TTL
+    return _not_minted_msg(user_id, "address {} is not active", nft_address), NFT_NOT_MINTED_CACHE_TTL
+
+
+def _get_cached_nft_result(user_id: int, current_time: float) -> Optional[str]:
+    """Return the cached NFT check result for a user if it hasn't expired"""
+    cached: Optional[NftResultCache] = _nft_result_cache.get(user_id)
+    if cached and current_time < cached["expires"]:
+        return cached["value"]
+    return None
+
+
+def _store_nft_result(user_id: int, value: str, expires: float) -> None:
+    """Cache an NFT check result for a user, evicting the oldest entry when full"""
+    _nft_result_cache.pop(user_id, None)
+    if len(_nft_result_cache) >= NFT_RESULT_CACHE_MAX_SIZE:
+        del _nft_result_cache[next(iter(_nft_result_cache))]
+    _nft_result_cache[user_id] = {"value": value, "expires": expires}
+
+
 async def get_nft_address(user_id: int) -> str:
+    """Get the NFT status message for a user, with short-lived caching"""
+    result: Optional[str] = _get_cached_nft_result(user_id, time.monotonic())
+    if result is not None:
+        return result
+
+    # Join a check already running for this user, so concurrent taps share its result
+    task: Optional["asyncio.Task[str]"] = _nft_lookup_tasks.get(user_id)
+    if task is None:
+        task = asyncio.ensure_future(_lookup_and_cache_nft_address(user_id))
+        _nft_lookup_tasks[user_id] = task
+        task.add_done_callback(lambda _: _nft_lookup_tasks.pop(user_id, None))
+
+    # Shield the shared lookup so one cancelled caller doesn't cancel it for the others
+    return await asyncio.shield(task)
+
+
+async def _lookup_and_cache_nft_address(user_id: int) -> str:
+    """Look up a user's NFT status and cache definitive answers"""
+    result: str
+    ttl: int
+    result, ttl = await _lookup_nft_address(user_id)
+
+    # Only definitive answers have a TTL, errors should be retried right away.
+    # The TTL starts once the lookup finishes, so slow lookups don't shorten it.
+    if ttl > 0:
+        _store_nft_result(user_id, result, time.monotonic() + ttl)
+    return result
+
+
+async def _lookup_nft_address(user_id: int) -> NftLookupResult:
     """Get the NFT address for a user and verify if it's active"""
     try:
+        # The NFT address for an index never changes, so once known only its state needs checking
+        known_address: Optional[str] = _known_nft_addresses.get(user_id)
+        if known_address:
+            return await _check_nft_status(user_id, known_address)
+
         # First, get the current seqno from the blockchain
         current_seqno: int = await get_current_seqno()
         rest_url: str = f"{QUICKNODE_ENDPOINT.rstrip('/')}/runGetMethod"
 
         # Prepare payload according to the documentation
-        payload: Dict[str, Any] = {
-            "address": CONTRACT_ADDRESS,
-            "method": "get_nft_address_by_index",
-            "stack": [["num", str(user_id)]],
-            "seqno": current_seqno
-        }
+        payload: bytes = (_RUN_GET_METHOD_PAYLOAD_TEMPLATE % (int(user_id), current_seqno)).encode()
 
         session: aiohttp.ClientSession = await get_session()
         try:
             async with session.post(
                     rest_url,
-                    json=payload,
-                    headers={"Content-Type": "application/json", "accept": "application/json"},
+                    data=payload,
+                    headers=_JSON_POST_HEADERS,
                     raise_for_status=True
             ) as response:
-                data: Dict[str, Any] = await response.json()
+                data: Dict[str, Any] = await read_json_response(response)
         except aiohttp.ClientResponseError as e:
-            return f"Error communicating with blockchain: Status {e.status}"
+            return f"Error communicating with blockchain: Status {e.status}", 0
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning(f"Network error calling runGetMethod: {e!r}")
+            return "Error communicating with blockchain: connection failed", 0
+        except ValueError as e:
+            logger.warning(f"Invalid response from runGetMethod: {e}")
+            return "Error communicating with blockchain: invalid response", 0
 
         # Check if request was successful
         if not data.get("ok", False):
             error_msg: str = data.get("error", "Unknown error")
-            return f"Blockchain error: {error_msg}"
+            return f"Blockchain error: {error_msg}", 0
 
         result: Optional[Dict[str, Any]] = data.get("result")
         if not result:
-            return "Invalid response from blockchain"
+            return "Invalid response from blockchain", 0
 
         # Check exit code
         exit_code: Optional[int] = result.get("exit_code")
         if exit_code is not None and exit_code not in [0, -1, -14]:
-            return f"ℹ️ NFT for user {user_id} is likely not minted (exit code: {exit_code})."
+            return _not_minted_msg(user_id, "exit code: {}", exit_code, likely=True), NFT_NOT_MINTED_CACHE_TTL
 
         if exit_code == -14:
-            return f"ℹ️ NFT for user {user_id} is not minted (index not found in collection)."
+            return _not_minted_msg(user_id, "index not found in collection"), NFT_NOT_MINTED_CACHE_TTL
 
         # Process stack result
         stack: Optional[List[Any]] = result.get("stack")
         if not stack or len(stack) == 0:
-            return f"ℹ️ NFT for user {user_id} is not minted (empty stack)."
+            return _not_minted_msg(user_id, "empty stack"), NFT_NOT_MINTED_CACHE_TTL
 
         # Get first stack item
         item_type: str
@@ -300,37 +559,30 @@ async def get_nft_address(user_id: int) -> str:
         if item_type == "cell" and isinstance(item_value, dict) and "bytes" in item_value:
             cell_boc_b64: str = item_value["bytes"]
             try:
-                # Decode and parse cell
-                cell_bytes: bytes = base64.b64decode(cell_boc_b64)
-                deserialized_cell: Cell = Cell.one_from_boc(cell_bytes)
-                addr_slice = deserialized_cell.begin_parse()
-                nft_addr_obj: Optional[Address] = addr_slice.load_address()
-
-                if not nft_addr_obj or nft_addr_obj.hash_part == b'\x00' * 32:
-                    return f"ℹ️ NFT for user {user_id} is not minted (zero address returned)."
-
-                # Convert address to string format
-                nft_address_str: str = nft_addr_obj.to_str(is_user_friendly=True, is_bounceable=True,
-                                                      is_url_safe=True)
-
-                # Check if NFT is active
-                is_active: bool = await check_nft_active(nft_address_str)
-                if is_active:
-                    return f"✅ Minted NFT Address: {nft_address_str}"
-                else:
-                    return f"ℹ️ NFT for user {user_id} is not minted (address {nft_address_str} is not active)."
+                nft_address_str: Optional[str] = _parse_nft_cell(cell_boc_b64)
+                if not nft_address_str:
+                    return _not_minted_msg(user_id, "zero address returned"), NFT_NOT_MINTED_CACHE_TTL
+
+                _remember_nft_address(user_id, nft_address_str)
+                return await _check_nft_status(user_id, nft_address_str)
 
             except Exception as e:
-                return f"⚠️ Error processing blockchain data: {str(e)}"
+                return f"⚠️ Error processing blockchain data: {str(e)}", 0
 
         elif item_type == "null" or (item_type == "num" and item_value == "0"):
-            return f"ℹ️ NFT for user {user_id} is not minted (no address found)."
+            return _not_minted_msg(user_id, "no address found"), NFT_NOT_MINTED_CACHE_TTL
         else:
-            return "Unexpected data format in blockchain response."
+            return "Unexpected data format in blockchain response.", 0
 
     except Exception as e:
         logger.exception(f"Error getting NFT address: {e}")
-        return f"An unexpected error occurred: {str(e)}"
+        return f"An unexpected error occurred: {str(e)}", 0
+
+
+# The check payment button is the same for every user, so build it only once
+_CHECK_PAYMENT_ROW: List[InlineKeyboardButton] = [
+    InlineKeyboardButton(text="🔍 Check Payment", callback_data="check_payment")
+]
 
 
 @router.message(Command("start"))
@@ -340,7 +592,7 @@ async def cmd_start(message: types.Message) -> None:
     keyboard: InlineKeyboardMarkup = InlineKeyboardMarkup(
         inline_keyboard=[
             [InlineKeyboardButton(text="🪵 Get Tung Tung Tung Sahur", web_app=WebAppInfo(url=payment_url))],
-            [InlineKeyboardButton(text="🔍 Check Payment", callback_data="check_payment")]
+            _CHECK_PAYMENT_ROW
         ]
     )
     await message.answer(
@@ -373,7 +625,7 @@ async def web_app_handler(message: types.Message) -> None:
 
     try:
         # Parse web app data
-        parsed_data: Dict[str, Any] = json.loads(web_app_data_str)
+        parsed_data: Dict[str, Any] = json_loads(web_app_data_str)
         init_data: Optional[str] = parsed_data.get("initData")
 
         if not init_data:
@@ -414,16 +666,38 @@ async def web_app_handler(message: types.Message) -> None:
 dp.include_router(router)
 
 
+# Minimal valid BOC (a single empty cell) used to warm up pytoniq_core at startup
+_EMPTY_CELL_BOC_B64: str = "te6cckEBAQEAAgAAAEysuc0="
+
+
 async def on_startup() -> None:
     """Initialize resources when the bot starts"""
-    global http_session
+    global http_session, _seqno_refresh_task
     http_session = await get_session()
+    _seqno_refresh_task = asyncio.create_task(refresh_seqno_periodically())
+
+    # Warm up pytoniq_core so the first user check doesn't pay its one-off init cost
+    try:
+        Cell.one_from_boc(base64.b64decode(_EMPTY_CELL_BOC_B64)).begin_parse()
+    except Exception as e:
+        logger.warning(f"pytoniq_core warm-up failed: {e}")
+
     logger.info("Bot is starting...")
 
 
 async def on_shutdown() -> None:
     """Clean up resources when the bot shuts down"""
-    global http_session
+    global http_session, _seqno_refresh_task, _seqno_fetch_task
+    for task in (_seqno_refresh_task, _seqno_fetch_task):
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+    _seqno_refresh_task = None
+    _seqno_fetch_task = None
+
     if http_session and not http_session.closed:
         await http_session.close()
         logger.info("HTTP session closed")
@@ -446,7 +720,15 @@ async def main() -> None:
 if __name__ == "__main__":
     try:
         logger.info("Starting Tung Tung Tung Sahur NFT Bot...")
-        asyncio.run(main())
+        run: Callable[[Any], Any] = asyncio.run
+        if HAS_UVLOOP:
+            logger.info("Using uvloop event loop")
+            if hasattr(uvloop, "run"):
+                run = uvloop.run
+            else:
+                # uvloop < 0.18 has no run(), install() is only deprecated on newer versions
+                uvloop.install()
+        run(main())
     except (KeyboardInterrupt, SystemExit):
         logger.info("Bot stopped")
     except Exception as e: